@@ -1,17 +1,30 @@
 import streamlit as st
 import os
-from groq import Groq
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 import json
 import re
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    from groq import Groq
+
+# Markdown code fence some models wrap JSON responses in
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.S)
 
 # Import our custom modules
 try:
     from config import Config
     from youtube_collector import YouTubeRecipeCollector
-    from recipe_processor import RecipeProcessor
+    from recipe_processor import RecipeProcessor, iter_unique
     YOUTUBE_AVAILABLE = True
 except ImportError as e:
     logging.warning(f"YouTube features not available: {e}")
@@ -35,18 +48,24 @@ st.write("Generate personalized shopping lists based on your favorite dishes, en
 # --- Configuration ---
 try:
     config = Config.validate()
-    client = Groq(api_key=config.GROQ_API_KEY)
 except ValueError as e:
     st.error(f"Configuration error: {e}")
     st.stop()
 
-# Initialize components
-if YOUTUBE_AVAILABLE:
-    youtube_collector = YouTubeRecipeCollector()
-    recipe_processor = RecipeProcessor()
-else:
-    youtube_collector = None
-    recipe_processor = None
+# Shared components are built once per process and reused across reruns
+@st.cache_resource
+def get_groq() -> "Groq":
+    # Imported on first use so the UI can render before the SDK loads
+    from groq import Groq
+    return Groq(api_key=config.GROQ_API_KEY)
+
+@st.cache_resource
+def get_youtube() -> "YouTubeRecipeCollector":
+    return YouTubeRecipeCollector()
+
+@st.cache_resource
+def get_processor() -> "RecipeProcessor":
+    return RecipeProcessor()
 
 # Initialize session state
 if "shopping_list" not in st.session_state:
@@ -57,8 +76,26 @@ if "video_tutorials" not in st.session_state:
     st.session_state.video_tutorials = []
 if "cooking_instructions" not in st.session_state:
     st.session_state.cooking_instructions = []
+if "list_stats" not in st.session_state:
+    st.session_state.list_stats = (0, 0)  # (total items, non-empty categories)
 
 # --- Enhanced Functions ---
+def _json_dumps(obj) -> str:
+    """
+    Canonical (sorted keys, indented) JSON dump, using orjson when available
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(obj, indent=2, sort_keys=True)
+
+def _json_loads(s: str):
+    """
+    Parse JSON, using orjson when available
+    """
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
 def generate_shopping_list_with_ai(dishes: List[str], use_youtube: bool = True) -> Dict:
     """
     Enhanced shopping list generation with optional YouTube integration
@@ -71,30 +108,57 @@ def generate_shopping_list_with_ai(dishes: List[str], use_youtube: bool = True)
     }
     
     # If YouTube is available and enabled, collect recipe data
-    if use_youtube and YOUTUBE_AVAILABLE and youtube_collector.youtube:
+    if use_youtube and YOUTUBE_AVAILABLE and get_youtube().youtube:
         st.info("🔍 Searching YouTube for recipe videos...")
+        recipe_processor = get_processor()
         
+        def fetch(dish: str):
+            try:
+                recipe_data = _cached_recipe_data(dish)
+            except LookupError:
+                return dish, None, [], [], []
+            summary = recipe_processor.generate_recipe_summary(recipe_data)
+            return (
+                dish,
+                summary,
+                recipe_data.get("ingredients", []),
+                summary.get("video_tutorials", []),
+                summary.get("cooking_instructions", []),
+            )
+        
+        # Dishes are fetched concurrently since the work is network-bound
+        fetched = {}
+        with st.spinner(f"Analyzing recipes for {len(dishes)} dish(es)..."):
+            with ThreadPoolExecutor(max_workers=min(8, len(dishes))) as executor:
+                futures = [executor.submit(fetch, dish) for dish in dishes]
+                for future in as_completed(futures):
+                    dish, *data = future.result()
+                    fetched[dish] = data
+        
+        # Aggregate in input order so the output is stable across runs
         all_ingredients = []
         for dish in dishes:
-            with st.spinner(f"Analyzing recipes for {dish}..."):
-                recipe_data = youtube_collector.get_recipe_data(dish)
-                if recipe_data:
-                    summary = recipe_processor.generate_recipe_summary(recipe_data)
-                    result["recipe_data"][dish] = summary
-                    all_ingredients.extend(recipe_data.get("ingredients", []))
-                    result["video_tutorials"].extend(summary.get("video_tutorials", []))
-                    result["cooking_instructions"].extend(summary.get("cooking_instructions", []))
+            summary, ingredients, tutorials, instructions = fetched[dish]
+            if summary:
+                result["recipe_data"][dish] = summary
+                all_ingredients.extend(ingredients)
+                result["video_tutorials"].extend(tutorials)
+                result["cooking_instructions"].extend(instructions)
         
         # Process and categorize ingredients
         if all_ingredients:
             result["shopping_list"] = recipe_processor.process_ingredients_list(all_ingredients)
+        
+        # YouTube data is complete enough on its own; skip the AI round trip
+        if len(result["shopping_list"]) >= config.K_CATEGORIES_READY:
+            return result
     
     # Fallback to AI-only generation or enhance AI with YouTube data
     ai_list = generate_ai_shopping_list(dishes, result["shopping_list"])
     
     # Merge AI results with YouTube data
     if result["shopping_list"]:
-        result["shopping_list"] = recipe_processor.merge_shopping_lists(
+        result["shopping_list"] = get_processor().merge_shopping_lists(
             result["shopping_list"], ai_list
         )
     else:
@@ -106,11 +170,30 @@ def generate_ai_shopping_list(dishes: List[str], existing_list: Dict = None) ->
     """
     Generate shopping list using AI with optional existing ingredients context
     """
-    dishes_text = ", ".join(dishes)
+    # Canonical, hashable cache key: order of dishes and dict keys doesn't matter
+    dishes_key = tuple(sorted(dishes))
+    existing_json = _json_dumps(existing_list) if existing_list else ""
+    # Topping up an existing list is simple classification; the fast tier suffices
+    model = config.GROQ_MODEL_FAST if existing_list else config.GROQ_MODEL
+
+    try:
+        return _cached_ai_list(dishes_key, existing_json, model)
+    except Exception as e:
+        st.error(f"Error generating AI shopping list: {e}")
+        return {}
+
+@st.cache_data(persist="disk", max_entries=1000, show_spinner=False)
+def _cached_ai_list(dishes_tuple: tuple, existing_json: str, model: str) -> Dict:
+    """
+    Run the Groq completion for a canonical set of dishes, streaming tokens
+    into a live preview as they arrive. Errors propagate so that failed
+    completions are never cached.
+    """
+    dishes_text = ", ".join(dishes_tuple)
     
     context = ""
-    if existing_list:
-        context = f"\nExisting ingredients found from recipe analysis: {json.dumps(existing_list, indent=2)}\n"
+    if existing_json:
+        context = f"\nExisting ingredients found from recipe analysis: {existing_json}\n"
     
     prompt = f"""
     You are an expert chef and shopping list assistant.
@@ -127,31 +210,72 @@ def generate_ai_shopping_list(dishes: List[str], existing_list: Dict = None) ->
     Generate the shopping list now.
     """
 
+    # The preview lives inside the cached function so Streamlit can replay it
+    # on a cache hit; it is cleared again before returning
+    placeholder = st.empty()
     try:
-        chat_completion = client.chat.completions.create(
-            messages=[{
-                "role": "user",
-                "content": prompt,
-            }],
-            model=config.GROQ_MODEL,
-            temperature=config.TEMPERATURE,
-            response_format={"type": "json_object"},
-        )
-        
-        response_text = chat_completion.choices[0].message.content
-        
-        # Clean JSON response
-        json_match = re.search(r"```json\n(.*)\n```", response_text, re.S)
+        response_text = _stream_completion(prompt, model, placeholder)
+    finally:
+        placeholder.empty()
+    
+    # Clean JSON response; JSON mode rarely emits fences, so check cheaply first
+    json_str = response_text.strip()
+    if json_str.startswith("```"):
+        json_match = _FENCE_RE.match(json_str)
         if json_match:
             json_str = json_match.group(1)
-        else:
-            json_str = response_text
-            
-        return json.loads(json_str)
+        
+    return _json_loads(json_str)
 
-    except Exception as e:
-        st.error(f"Error generating AI shopping list: {e}")
-        return {}
+def _stream_completion(prompt: str, model: str, placeholder) -> str:
+    """
+    Stream a JSON-mode completion into `placeholder`, redrawing at most every
+    STREAM_REFRESH_INTERVAL seconds. Falls back to a single request if the
+    API rejects streaming together with JSON mode.
+    """
+    from groq import BadRequestError
+    
+    request = dict(
+        messages=[{
+            "role": "user",
+            "content": prompt,
+        }],
+        model=model,
+        temperature=config.TEMPERATURE,
+        max_tokens=config.MAX_TOKENS,
+        response_format={"type": "json_object"},
+    )
+    
+    try:
+        stream = get_groq().chat.completions.create(**request, stream=True)
+    except BadRequestError as e:
+        logging.warning(f"Streaming JSON completion rejected, retrying without streaming: {e}")
+        return get_groq().chat.completions.create(**request).choices[0].message.content
+    
+    parts = []
+    last_draw = 0.0
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            now = time.monotonic()
+            if now - last_draw >= config.STREAM_REFRESH_INTERVAL:
+                placeholder.code("".join(parts), language="json")
+                last_draw = now
+    
+    return "".join(parts)
+
+@st.cache_data(persist="disk", max_entries=1000, show_spinner=False)
+def _cached_recipe_data(dish: str) -> Dict:
+    """
+    Collect YouTube recipe data for a single dish. Raises LookupError when no
+    transcript was fetched, so transient API failures are never cached; a
+    dish with transcripts but no extracted ingredients is still returned.
+    """
+    recipe_data = get_youtube().get_recipe_data(dish)
+    if not any(video.get("transcript") for video in recipe_data["videos"]):
+        raise LookupError(f"No YouTube recipe data for {dish!r}")
+    return recipe_data
 
 def display_enhanced_shopping_list():
     """
@@ -166,33 +290,29 @@ def display_enhanced_shopping_list():
     with col1:
         st.subheader("🛍️ Your Shopping List")
         
-        all_items = []
+        unchecked = []
         for category, items in st.session_state.shopping_list.items():
             if items:  # Only show categories with items
                 st.markdown(f"**{category}**")
                 for i, item in enumerate(items):
                     key = f"{category}-{i}-{item}"
-                    checked = st.checkbox(item, key=key)
-                    if not checked:
-                        all_items.append(item)
+                    if not st.checkbox(item, key=key):
+                        unchecked.append(item)
                 st.markdown("---")
         
         # Download options
-        if all_items:
-            list_text = "\n".join([f"• {item}" for item in all_items])
+        if unchecked:
             st.download_button(
                 label="📄 Download Shopping List",
-                data=list_text,
+                data="\n".join(f"• {item}" for item in unchecked),
                 file_name=f"shopping_list_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
                 mime="text/plain"
             )
     
     with col2:
         st.subheader("📊 List Summary")
-        total_items = sum(len(items) for items in st.session_state.shopping_list.values())
+        total_items, categories = st.session_state.list_stats
         st.metric("Total Items", total_items)
-        
-        categories = len([cat for cat, items in st.session_state.shopping_list.items() if items])
         st.metric("Categories", categories)
 
 def display_video_tutorials():
@@ -226,7 +346,7 @@ def display_cooking_instructions():
         
     st.subheader("👨‍🍳 Cooking Instructions")
     
-    instructions = list(set(st.session_state.cooking_instructions))[:10]  # Remove duplicates, max 10
+    instructions = list(islice(iter_unique(st.session_state.cooking_instructions), 10))  # Remove duplicates, max 10
     
     for i, instruction in enumerate(instructions, 1):
         st.write(f"{i}. {instruction}")
@@ -271,6 +391,7 @@ with st.sidebar:
         st.session_state.recipe_data = {}
         st.session_state.video_tutorials = []
         st.session_state.cooking_instructions = []
+        st.session_state.list_stats = (0, 0)
         st.rerun()
 
 # --- Main UI Layout ---
@@ -306,6 +427,10 @@ if submitted and dishes_input.strip():
             
             # Update session state
             st.session_state.shopping_list = result["shopping_list"]
+            st.session_state.list_stats = (
+                sum(len(items) for items in result["shopping_list"].values()),
+                sum(1 for items in result["shopping_list"].values() if items),
+            )
             st.session_state.video_tutorials = result["video_tutorials"]
             st.session_state.cooking_instructions = result["cooking_instructions"]
             st.session_state.recipe_data = result["recipe_data"]
@@ -17,15 +17,24 @@ class Config:
     
     # Model settings
     GROQ_MODEL: str = "llama3-8b-8192"
-    TEMPERATURE: float = 0.2
+    GROQ_MODEL_FAST: str = "llama-3.1-8b-instant"  # used to top up YouTube-derived lists
+    TEMPERATURE: float = 0.0  # deterministic output keeps cached completions valid
+    MAX_TOKENS: int = 800
+    STREAM_REFRESH_INTERVAL: float = 0.2  # seconds between redraws of the streamed preview
     
     # File paths
     RECIPE_DATA_DIR: str = "data/recipes"
+    CACHE_DIR: str = "data/cache"  # transcript and search cache (needs diskcache)
     MODEL_DIR: str = "models"
     
     # Recipe extraction settings
     MIN_VIDEO_DURATION: int = 60  # seconds
     MAX_VIDEO_DURATION: int = 1800  # 30 minutes
+    SEARCH_CACHE_TTL: int = 86400  # seconds; transcripts are cached indefinitely
+    REGEX_TIMEOUT: float = 2.0  # seconds per transcript for ingredient matching
+    
+    # Skip the AI pass when YouTube data already fills this many categories
+    K_CATEGORIES_READY: int = 5
     
     @classmethod
     def validate(cls):
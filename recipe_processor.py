@@ -2,21 +2,44 @@
 Recipe data processor for cleaning and structuring extracted data
 """
 import re
-import json
-import nltk
-from typing import List, Dict, Tuple
+from typing import Iterable, Iterator, List, Dict, Tuple
 from collections import defaultdict
+from itertools import islice
 import logging
 
-# Download required NLTK data
 try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-except:
-    pass
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Precompiled patterns shared by all RecipeProcessor instances
+_WS_RE = re.compile(r'\s+')
+_QTY_RE = re.compile(r'(\d+(?:\.\d+)?(?:\s*[-/]\s*\d+(?:\.\d+)?)?)\s+(.+)')
+_SENT_SPLIT_RE = re.compile(r'[.!?]+')
+# Only presence matters, so no trailing `.*`; the leading \b keeps "know" or
+# "paddle" out while still matching inflections like "adding" or "stirred"
+_INSTR_KEYWORDS = re.compile(
+    r'\b(?:first|then|next|after|now|finally'
+    r'|heat|cook|add|mix|stir|pour|place|put|season|serve'
+    r'|preheat|boil|simmer|saut[eé]|fry|bake|roast|grill)',
+    re.IGNORECASE
+)
+
+def iter_unique(items: Iterable[str]) -> Iterator[str]:
+    """
+    Yield items in order, skipping ones already seen
+    """
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            yield item
 
 class RecipeProcessor:
+    # Display order of categories in a processed shopping list
+    _CATEGORY_ORDER = ("Produce", "Meat & Seafood", "Dairy & Eggs", "Pantry Staples",
+                       "Bakery", "Condiments", "Frozen", "Other")
+    
     def __init__(self):
         self.food_categories = {
             "Produce": ["onion", "garlic", "tomato", "carrot", "celery", "pepper", "lettuce", "spinach", 
@@ -39,36 +62,43 @@ class RecipeProcessor:
             "kilogram", "kg", "milliliter", "ml", "liter", "liters", "pint", "quart", "gallon",
             "pinch", "dash", "handful", "clove", "cloves", "piece", "pieces", "slice", "slices"
         ]
+        # Longest units first so "tablespoons" wins over "tablespoon" and "cups"
+        # over "cup"; \b stops "g" from matching the start of "garlic"
+        units_alternation = '|'.join(map(re.escape, sorted(self.units, key=len, reverse=True)))
+        self._qty_unit_re = re.compile(
+            rf'(\d+(?:\.\d+)?(?:\s*[-/]\s*\d+(?:\.\d+)?)?)\s*({units_alternation})\b\s*(?:of\s+)?(.+)'
+        )
         
-        # spaCy removed; using NLTK for NLP processing
-        self.nlp = None
+        # Flat keyword -> (category position, category) map; the position lets
+        # the earliest category win, and a keyword listed twice keeps the first
+        self._kw_to_cat: Dict[str, Tuple[int, str]] = {}
+        for priority, (category, keywords) in enumerate(self.food_categories.items()):
+            for keyword in keywords:
+                self._kw_to_cat.setdefault(keyword, (priority, category))
+        self._kw_max_words = max(len(keyword.split()) for keyword in self._kw_to_cat)
+        
+        # Keyword automaton for substring matching, when available
+        self._ac = None
+        if ahocorasick is not None:
+            self._ac = ahocorasick.Automaton()
+            for keyword, value in self._kw_to_cat.items():
+                self._ac.add_word(keyword, value)
+            self._ac.make_automaton()
     
     def clean_ingredient(self, ingredient: str) -> str:
         """
         Clean and normalize an ingredient string
         """
-        # Remove extra whitespace
-        ingredient = re.sub(r'\s+', ' ', ingredient.strip())
-        
-        # Remove common cooking instructions that might be mixed in
-        cooking_words = ["chopped", "diced", "sliced", "minced", "grated", "fresh", "dried", 
-                        "ground", "whole", "large", "small", "medium", "fine", "coarse"]
-        
-        # Keep the cooking instruction but clean it
-        ingredient = ingredient.lower()
-        
-        return ingredient
+        # Lowercase and collapse whitespace; cooking words are kept as-is
+        return _WS_RE.sub(' ', ingredient.strip().lower())
     
     def extract_quantity_and_unit(self, ingredient: str) -> Tuple[str, str, str]:
         """
-        Extract quantity, unit, and item from ingredient string
+        Extract quantity, unit, and item from a cleaned (lowercase) ingredient
+        string, as returned by clean_ingredient
         """
-        # Pattern to match quantity, unit, and item
-        pattern = r'(\d+(?:\.\d+)?(?:\s*[-/]\s*\d+(?:\.\d+)?)?)\s*({})\s*(?:of\s+)?(.+)'.format(
-            '|'.join(self.units)
-        )
-        
-        match = re.match(pattern, ingredient.lower())
+        # Match quantity, unit, and item
+        match = self._qty_unit_re.match(ingredient)
         if match:
             quantity = match.group(1)
             unit = match.group(2)
@@ -76,8 +106,7 @@ class RecipeProcessor:
             return quantity, unit, item
         
         # If no unit found, try to extract just quantity and item
-        quantity_pattern = r'(\d+(?:\.\d+)?(?:\s*[-/]\s*\d+(?:\.\d+)?)?)\s+(.+)'
-        match = re.match(quantity_pattern, ingredient.lower())
+        match = _QTY_RE.match(ingredient)
         if match:
             quantity = match.group(1)
             item = match.group(2)
@@ -87,53 +116,62 @@ class RecipeProcessor:
     
     def categorize_ingredient(self, ingredient: str) -> str:
         """
-        Categorize an ingredient into food categories
+        Categorize a cleaned (lowercase) ingredient into food categories
         """
-        ingredient_lower = ingredient.lower()
+        if self._ac is not None:
+            best = min((value for _, value in self._ac.iter(ingredient)), default=None)
+        else:
+            best = min(self._iter_keyword_hits(ingredient), default=None)
         
-        for category, keywords in self.food_categories.items():
-            for keyword in keywords:
-                if keyword in ingredient_lower:
-                    return category
-        
-        return "Other"
+        return best[1] if best else "Other"
+    
+    def _iter_keyword_hits(self, ingredient_lower: str):
+        """
+        Yield (position, category) for every word n-gram that is a keyword,
+        also trying the singular of plural words ("onions" -> "onion")
+        """
+        tokens = [token.strip(",.;:()") for token in ingredient_lower.split()]
+        for n in range(self._kw_max_words, 0, -1):
+            for i in range(len(tokens) - n + 1):
+                phrase = " ".join(tokens[i:i + n])
+                keys = (phrase, phrase[:-1], phrase[:-2]) if phrase.endswith("s") else (phrase,)
+                hit = next(filter(None, map(self._kw_to_cat.get, keys)), None)
+                if hit:
+                    yield hit
     
     def process_ingredients_list(self, ingredients: List[str]) -> Dict[str, List[str]]:
         """
         Process a list of ingredients and categorize them
         """
         categorized = defaultdict(list)
+        seen = set()
         
+        # Dedupe as we go so repeated ingredients are only categorized once
         for ingredient in ingredients:
             cleaned = self.clean_ingredient(ingredient)
-            if cleaned and len(cleaned) > 2:
-                category = self.categorize_ingredient(cleaned)
-                categorized[category].append(cleaned)
-        
-        # Convert to regular dict and sort
-        result = {}
-        for category in ["Produce", "Meat & Seafood", "Dairy & Eggs", "Pantry Staples", "Bakery", "Condiments", "Frozen", "Other"]:
-            if category in categorized:
-                result[category] = sorted(list(set(categorized[category])))
-        
-        return result
+            if not cleaned or len(cleaned) <= 2 or cleaned in seen:
+                continue
+            seen.add(cleaned)
+            categorized[self.categorize_ingredient(cleaned)].append(cleaned)
+        
+        # Convert to regular dict in display order and sort
+        return {
+            category: sorted(categorized[category])
+            for category in self._CATEGORY_ORDER
+            if category in categorized
+        }
     
     def merge_shopping_lists(self, *lists: Dict[str, List[str]]) -> Dict[str, List[str]]:
         """
         Merge multiple shopping lists together
         """
-        merged = defaultdict(list)
+        merged: Dict[str, set] = defaultdict(set)
         
         for shopping_list in lists:
             for category, items in shopping_list.items():
-                merged[category].extend(items)
-        
-        # Remove duplicates and sort
-        result = {}
-        for category, items in merged.items():
-            result[category] = sorted(list(set(items)))
+                merged[category].update(items)
         
-        return result
+        return {category: sorted(items) for category, items in merged.items()}
     
     def extract_cooking_instructions(self, transcript: str) -> List[str]:
         """
@@ -142,22 +180,13 @@ class RecipeProcessor:
         instructions = []
         
         # Split transcript into sentences
-        sentences = re.split(r'[.!?]+', transcript)
-        
-        # Look for instruction patterns
-        instruction_patterns = [
-            r'(first|then|next|after|now|finally).*',
-            r'(heat|cook|add|mix|stir|pour|place|put|season|serve).*',
-            r'(preheat|boil|simmer|sauté|fry|bake|roast|grill).*'
-        ]
+        sentences = _SENT_SPLIT_RE.split(transcript)
         
+        # Look for instruction keywords
         for sentence in sentences:
             sentence = sentence.strip()
-            if len(sentence) > 10:
-                for pattern in instruction_patterns:
-                    if re.search(pattern, sentence.lower()):
-                        instructions.append(sentence)
-                        break
+            if len(sentence) > 10 and _INSTR_KEYWORDS.search(sentence):
+                instructions.append(sentence)
         
         return instructions[:10]  # Return top 10 instructions
     
@@ -193,7 +222,7 @@ class RecipeProcessor:
                 }
                 summary["video_tutorials"].append(tutorial)
         
-        # Remove duplicate instructions
-        summary["cooking_instructions"] = list(set(summary["cooking_instructions"]))[:15]
+        # Remove duplicate instructions, keeping transcript order
+        summary["cooking_instructions"] = list(islice(iter_unique(summary["cooking_instructions"]), 15))
         
         return summary
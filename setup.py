@@ -2,20 +2,8 @@
 """
 Setup script for the AI Shopping List Generator
 """
-import subprocess
-import sys
 import os
 
-def install_spacy_model():
-    """Install the spaCy English model"""
-    try:
-        print("Installing spaCy English model...")
-        subprocess.run([sys.executable, "-m", "spacy", "download", "en_core_web_sm"], check=True)
-        print("✅ spaCy model installed successfully!")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to install spaCy model: {e}")
-        print("You can install it manually with: python -m spacy download en_core_web_sm")
-
 def create_env_file():
     """Create a sample .env file"""
     env_content = """# AI Shopping List Generator Environment Variables
@@ -38,9 +26,6 @@ YOUTUBE_API_KEY=your_youtube_api_key_here
 def main():
     print("🚀 Setting up AI Shopping List Generator...")
     
-    # Install spaCy model
-    install_spacy_model()
-    
     # Create environment file
     create_env_file()
     
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the YouTube recipe flow in the Streamlit app
+"""
+import os
+
+import pytest
+
+pytest.importorskip("googleapiclient")
+pytest.importorskip("groq")
+
+import groq
+import streamlit as st
+import youtube_collector
+from config import Config
+from streamlit.testing.v1 import AppTest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+class FakeCollector:
+    """Collector whose videos loaded fine but yielded no ingredient matches"""
+    youtube = object()
+
+    def get_recipe_data(self, dish_name):
+        return {
+            "dish_name": dish_name,
+            "videos": [{
+                "video_id": "abc123",
+                "title": "Easy pancakes",
+                "channel_title": "Test Kitchen",
+                "transcript": "first heat the pan. then pour in two cups of batter",
+                "extracted_ingredients": [],
+            }],
+            "ingredients": [],
+            "instructions": [],
+        }
+
+class FailingGroq:
+    """Groq client whose completions always fail, leaving only YouTube data"""
+    def __init__(self, api_key):
+        self.chat = self
+        self.completions = self
+
+    def create(self, **kwargs):
+        raise RuntimeError("no network in tests")
+
+def test_tutorials_survive_empty_ingredients(monkeypatch):
+    """A dish with transcripts but no extracted ingredients keeps its tutorials"""
+    monkeypatch.setattr(Config, "validate", classmethod(
+        lambda cls: cls(GROQ_API_KEY="test", YOUTUBE_API_KEY="test")
+    ))
+    monkeypatch.setattr(youtube_collector, "YouTubeRecipeCollector", FakeCollector)
+    monkeypatch.setattr(groq, "Groq", FailingGroq)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+    at = AppTest.from_file(APP_PATH, default_timeout=30).run()
+    at.text_area[0].input("Pancakes")
+    at.button[0].click().run()
+
+    assert not at.exception
+    tutorials = at.session_state.video_tutorials
+    assert [video["video_id"] for video in tutorials] == ["abc123"]
+    assert at.session_state.cooking_instructions
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Tests for ingredient categorization in the recipe processor
+"""
+import pytest
+
+from recipe_processor import RecipeProcessor
+
+MIXED_CASE_INGREDIENTS = ["2 Large ONIONS", "1 lb Ground Beef", "1 Cup MILK", "Fresh Basil"]
+EXPECTED = {
+    "Produce": ["2 large onions"],
+    "Meat & Seafood": ["1 lb ground beef"],
+    "Dairy & Eggs": ["1 cup milk"],
+    "Other": ["fresh basil"],
+}
+
+def test_mixed_case_with_automaton():
+    """Mixed-case input is categorized through the Aho-Corasick automaton"""
+    pytest.importorskip("ahocorasick")
+    processor = RecipeProcessor()
+    assert processor._ac is not None
+    assert processor.process_ingredients_list(MIXED_CASE_INGREDIENTS) == EXPECTED
+
+def test_mixed_case_with_keyword_lookup():
+    """Mixed-case input is categorized through the dict-lookup fallback"""
+    processor = RecipeProcessor()
+    processor._ac = None
+    assert processor.process_ingredients_list(MIXED_CASE_INGREDIENTS) == EXPECTED
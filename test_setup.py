@@ -20,16 +20,6 @@ def test_imports():
         from googleapiclient.discovery import build
         print("✅ Google API Client imported successfully")
         
-        import spacy
-        print("✅ spaCy imported successfully")
-        
-        import nltk
-        print("✅ NLTK imported successfully")
-        
-        # Test spaCy model
-        nlp = spacy.load("en_core_web_sm")
-        print("✅ spaCy English model loaded successfully")
-        
         return True
         
     except ImportError as e:
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests for ingredient extraction from YouTube transcripts
+"""
+import time
+
+import pytest
+
+pytest.importorskip("googleapiclient")
+
+import youtube_collector
+from youtube_collector import YouTubeRecipeCollector, _COMBINED
+
+SAMPLE_TRANSCRIPT = (
+    "Welcome back to the channel. Add 2 cups of flour. Then a pinch of salt. "
+    "Next 1 onion chopped. Finally 500g beef."
+)
+
+@pytest.fixture
+def collector(monkeypatch):
+    # Keep the disk cache out of the working tree
+    monkeypatch.setattr(youtube_collector, "diskcache", None)
+    return YouTubeRecipeCollector()
+
+@pytest.fixture(params=["prefiltered", "full scan"])
+def prematcher(request, monkeypatch):
+    """Run a test with the Aho-Corasick prefilter and without it"""
+    if request.param == "prefiltered":
+        pytest.importorskip("ahocorasick")
+    else:
+        monkeypatch.setattr(youtube_collector, "_PREMATCHER", None)
+    return request.param
+
+@pytest.mark.parametrize("tail", ["cups", "of nothing"])
+def test_long_digit_run_finishes(collector, prematcher, tail):
+    """A long "1 and then 2 and then ..." run can't make the regex backtrack for long"""
+    transcript = " ".join(f"{i} and then" for i in range(3000)) + f" {tail}"
+    started = time.monotonic()
+    ingredients = collector.extract_ingredients_from_transcript(transcript)
+    assert time.monotonic() - started < collector.config.REGEX_TIMEOUT
+    assert isinstance(ingredients, list)
+
+def test_common_ingredients_extracted(collector, prematcher):
+    """Each alternative of the combined pattern still fires"""
+    assert collector.extract_ingredients_from_transcript(SAMPLE_TRANSCRIPT) == [
+        "2 cups of flour", "a pinch of salt", "1 onion chopped", "500g beef"
+    ]
+
+def test_prefilter_matches_full_scan(collector):
+    """Scanning only the prefiltered windows finds the same matches as a full scan"""
+    pytest.importorskip("ahocorasick")
+    filler = "so today we are going to make something really delicious for the family. " * 5
+    lowered = (filler + SAMPLE_TRANSCRIPT + " stir in 3 tablespoons butter. ").lower() * 20
+    full_scan = [match[match.lastindex] for match in _COMBINED.finditer(lowered)]
+    assert full_scan
+    assert list(collector._iter_matches(lowered)) == full_scan
@@ -2,43 +2,154 @@
 YouTube API handler for recipe data collection
 """
 import os
+import gzip
 import json
+import time
 import logging
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from googleapiclient.discovery import build
+from googleapiclient.http import build_http
 from youtube_transcript_api import YouTubeTranscriptApi
-from youtube_transcript_api.formatters import TextFormatter
 import re
+import regex
 from config import Config
 
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Common ingredient patterns, fused into one alternation so a transcript is
+# scanned once; each alternative captures into its own group. Free-text runs
+# are capped at 40 characters (lazy when a keyword follows) so a long run of
+# digits and words can't make the engine backtrack across the whole transcript.
+# Compiled with `regex` so a pathological transcript can also be cut off by a
+# timeout. Case-sensitive on purpose: transcripts are lowercased once up front.
+# "<n> ... <unit>" and "<n> ... <action>" share one alternative.
+_UNITS = r'(?:cups?|tablespoons?|teaspoons?|tbsp|tsp|oz|pounds?|lbs?|grams?|g|ml|liters?)'
+_MEASURES = r'(?:pinch|dash|handful)'
+_ACTIONS = r'(?:chopped|diced|sliced|minced|grated)'
+_TEXT = r'[\w\s]{1,40}'
+_COMBINED = regex.compile(
+    rf'(\d+\s*{_UNITS}\s+(?:of\s+)?{_TEXT}\b)'
+    rf'|(\d+\s+{_TEXT}?\b(?:{_UNITS}|{_ACTIONS})\b)'
+    rf'|(a\s+{_MEASURES}\s+of\s+{_TEXT}\b)'
+)
+_WS_RE = re.compile(r'\s+')
+
+# Every ingredient pattern needs one of these literals (a unit, measure or
+# action word). A bare "g" would hit nearly every word, so it only counts
+# straight after a digit. Only text near a hit is handed to the full pattern.
+_PREMATCH_KEYWORDS = (
+    "cup", "tablespoon", "teaspoon", "tbsp", "tsp", "oz", "pound", "lb", "gram", "ml", "liter",
+    "pinch", "dash", "handful", "chopped", "diced", "sliced", "minced", "grated",
+    *(f"{digit}g" for digit in "0123456789"),
+    *(f"{digit} g" for digit in "0123456789"),
+)
+_PREMATCH_WINDOW = 80  # characters either side of a keyword hit
+
+# A search result needs one of these in its title or description to be worth
+# a transcript fetch; filters out reaction videos, vlogs and the like
+_RECIPE_HINTS = ("recipe", "ingredient", "cook", "how to make")
+
+_PREMATCHER = None
+if ahocorasick is not None:
+    _PREMATCHER = ahocorasick.Automaton()
+    for _keyword in _PREMATCH_KEYWORDS:
+        _PREMATCHER.add_word(_keyword, len(_keyword))
+    _PREMATCHER.make_automaton()
+
+def _candidate_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Return merged (start, end) windows around prematch keywords in lowercase
+    text, widened to whole words; the whole text without pyahocorasick
+    """
+    if _PREMATCHER is None:
+        return [(0, len(text))]
+    
+    spans = []
+    for last, length in _PREMATCHER.iter(text):
+        start = max(0, last - length + 1 - _PREMATCH_WINDOW)
+        start = text.rfind(" ", 0, start) + 1 if start else 0
+        end = text.find(" ", last + 1 + _PREMATCH_WINDOW)
+        end = len(text) if end == -1 else end
+        if spans and start <= spans[-1][1]:
+            spans[-1] = (min(spans[-1][0], start), max(spans[-1][1], end))
+        else:
+            spans.append((start, end))
+    return spans
+
+@lru_cache(maxsize=None)
+def _build_client(service_name: str, version: str, api_key: str):
+    """
+    Build a YouTube API client once per key and share it between collectors
+    """
+    return build(
+        service_name,
+        version,
+        developerKey=api_key,
+        static_discovery=True,  # bundled discovery document, no HTTP fetch
+        cache_discovery=False
+    )
+
 class YouTubeRecipeCollector:
     def __init__(self):
         self.config = Config()
         self.youtube = None
         if self.config.YOUTUBE_API_KEY:
-            self.youtube = build(
+            self.youtube = _build_client(
                 self.config.YOUTUBE_API_SERVICE_NAME,
                 self.config.YOUTUBE_API_VERSION,
-                developerKey=self.config.YOUTUBE_API_KEY
+                self.config.YOUTUBE_API_KEY
             )
         
+        # Transcripts and search results persisted across processes, when available
+        self._disk_cache = None
+        if diskcache is not None:
+            self._disk_cache = diskcache.Cache(self.config.CACHE_DIR)
+        
+        # Small per-instance memory cache in front of the disk cache; a
+        # class-level lru_cache would key on self and keep collectors alive
+        self._load_transcript = lru_cache(maxsize=32)(self._fetch_transcript)
+        
     def search_recipe_videos(self, query: str, max_results: int = 5) -> List[Dict]:
         """
         Search for recipe videos on YouTube
         """
         if not self.youtube:
             return []
+        
+        normalized_query = " ".join(query.lower().split())
+        cache_key = f"search:{max_results}:{normalized_query}"
+        if self._disk_cache is not None:
+            cached = self._disk_cache.get(cache_key)
+            if cached is not None:
+                return cached
             
         try:
             search_response = self.youtube.search().list(
                 q=f"{query} recipe cooking",
                 part="id,snippet",
+                # Only the fields read below, to keep the response small
+                fields="items(id/videoId,snippet(title,description,channelTitle,publishedAt,thumbnails/high/url))",
                 maxResults=max_results,
                 type="video",
                 videoDuration="medium",  # 4-20 minutes
                 videoDefinition="high",
                 order="relevance"
-            ).execute()
+            ).execute(http=build_http())  # shared client; httplib2 isn't thread-safe
             
             videos = []
             for item in search_response["items"]:
@@ -51,6 +162,9 @@ class YouTubeRecipeCollector:
                     "thumbnail_url": item["snippet"]["thumbnails"]["high"]["url"]
                 }
                 videos.append(video_data)
+            
+            if self._disk_cache is not None and videos:
+                self._disk_cache.set(cache_key, videos, expire=self.config.SEARCH_CACHE_TTL)
                 
             return videos
             
@@ -63,76 +177,126 @@ class YouTubeRecipeCollector:
         Get transcript for a YouTube video
         """
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-            formatter = TextFormatter()
-            transcript = formatter.format_transcript(transcript_list)
-            return transcript
+            return self._load_transcript(video_id)
         except Exception as e:
             logging.error(f"Error getting transcript for video {video_id}: {e}")
             return None
     
-    def extract_ingredients_from_transcript(self, transcript: str) -> List[str]:
+    def _fetch_transcript(self, video_id: str) -> str:
         """
-        Extract ingredients from video transcript using regex patterns
+        Fetch a transcript through the disk cache. Raises on failure so that
+        errors are never cached.
         """
-        ingredients = []
+        cache_key = f"transcript:{video_id}"
+        if self._disk_cache is not None:
+            cached = self._disk_cache.get(cache_key)
+            if cached is not None:
+                return gzip.decompress(cached).decode("utf-8")
         
-        # Common ingredient patterns
-        patterns = [
-            r'(\d+\s*(?:cups?|tablespoons?|teaspoons?|tbsp|tsp|oz|pounds?|lbs?|grams?|g|ml|liters?)\s+(?:of\s+)?[\w\s]+)',
-            r'(\d+\s+[\w\s]+(?:cups?|tablespoons?|teaspoons?|tbsp|tsp|oz|pounds?|lbs?|grams?|g|ml|liters?))',
-            r'(a\s+(?:pinch|dash|handful)\s+of\s+[\w\s]+)',
-            r'(\d+\s+[\w\s]+(?:chopped|diced|sliced|minced|grated))',
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, transcript, re.IGNORECASE)
-            ingredients.extend(matches)
+        # Timestamps aren't used, so join the segment texts directly
+        transcript = " ".join(
+            segment["text"] for segment in YouTubeTranscriptApi.get_transcript(video_id)
+        )
         
-        # Clean up ingredients
-        cleaned_ingredients = []
-        for ingredient in ingredients:
-            ingredient = ingredient.strip()
-            if len(ingredient) > 3 and len(ingredient) < 100:
-                cleaned_ingredients.append(ingredient)
-        
-        return list(set(cleaned_ingredients))  # Remove duplicates
+        if self._disk_cache is not None:
+            self._disk_cache.set(cache_key, gzip.compress(transcript.encode("utf-8")))
+        return transcript
+    
+    def extract_ingredients_from_transcript(self, transcript: str) -> List[str]:
+        """
+        Extract ingredients from video transcript using regex patterns
+        """
+        matches = self._iter_matches(transcript.lower())
+        try:
+            # Normalize whitespace (already lowercase), drop implausible lengths,
+            # and remove duplicates while keeping transcript order
+            return list({
+                ingredient: None
+                for match in matches
+                if 3 < len(ingredient := _WS_RE.sub(' ', match.strip())) < 100
+            })
+        except TimeoutError:
+            logging.warning(f"Ingredient extraction timed out on a {len(transcript)}-character transcript")
+            return []
+    
+    def _iter_matches(self, lowered: str):
+        """
+        Yield raw ingredient matches from a lowercased transcript, sharing one
+        REGEX_TIMEOUT deadline across all candidate windows
+        """
+        deadline = time.monotonic() + self.config.REGEX_TIMEOUT
+        for start, end in _candidate_spans(lowered):
+            for match in _COMBINED.finditer(
+                lowered, start, end, timeout=max(deadline - time.monotonic(), 0.0)
+            ):
+                yield match[match.lastindex]
     
     def get_recipe_data(self, dish_name: str) -> Dict:
         """
         Get comprehensive recipe data for a dish
         """
-        videos = self.search_recipe_videos(dish_name)
+        videos = [
+            video for video in self.search_recipe_videos(dish_name)
+            if any(hint in f"{video['title']} {video['description']}".lower() for hint in _RECIPE_HINTS)
+        ]
         recipe_data = {
             "dish_name": dish_name,
             "videos": [],
             "ingredients": [],
             "instructions": []
         }
+        all_ingredients = {}  # ordered set across videos
         
-        for video in videos:
-            transcript = self.get_video_transcript(video["video_id"])
+        # Transcript fetches are independent network round trips; run them together
+        transcripts = []
+        if videos:
+            with ThreadPoolExecutor(max_workers=min(8, len(videos))) as executor:
+                transcripts = list(executor.map(
+                    self.get_video_transcript, [video["video_id"] for video in videos]
+                ))
+        
+        for video, transcript in zip(videos, transcripts):
             if transcript:
                 ingredients = self.extract_ingredients_from_transcript(transcript)
                 video["transcript"] = transcript
                 video["extracted_ingredients"] = ingredients
-                recipe_data["ingredients"].extend(ingredients)
+                all_ingredients.update(dict.fromkeys(ingredients))
                 
             recipe_data["videos"].append(video)
         
-        # Remove duplicate ingredients
-        recipe_data["ingredients"] = list(set(recipe_data["ingredients"]))
+        recipe_data["ingredients"] = list(all_ingredients)
         
         return recipe_data
     
-    def save_recipe_data(self, recipe_data: Dict, filename: str):
+    def save_recipe_data(self, recipe_data: Dict, filename: str, keep_transcripts: bool = False):
         """
-        Save recipe data to JSON file
+        Save recipe data to JSON file. The file is written to a temporary path
+        and renamed into place, so readers never see a partial file.
+        Video transcripts are left out unless `keep_transcripts` is set.
         """
+        if not keep_transcripts:
+            # Transcripts are most of the payload and only needed in memory
+            recipe_data = {
+                **recipe_data,
+                "videos": [
+                    {key: value for key, value in video.items() if key != "transcript"}
+                    for video in recipe_data.get("videos", [])
+                ]
+            }
+        
         os.makedirs(self.config.RECIPE_DATA_DIR, exist_ok=True)
         filepath = os.path.join(self.config.RECIPE_DATA_DIR, f"{filename}.json")
+        tmp_path = f"{filepath}.tmp"
         
-        with open(filepath, 'w') as f:
-            json.dump(recipe_data, f, indent=2)
+        with open(tmp_path, 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(recipe_data))
+            else:
+                # Stream the encoding instead of building the whole string
+                for chunk in json.JSONEncoder().iterencode(recipe_data):
+                    f.write(chunk.encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
         
         return filepath